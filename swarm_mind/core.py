@@ -17,6 +17,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 import logging
 
+from swarm_mind.project_files import iter_python_files
+
 # Настройка логирования
 logging.basicConfig(
     level=logging.INFO,
@@ -253,23 +255,19 @@ class CodeAnalyzerAgent(BaseAgent):
             'results': analysis
         })
         
-        self.logger.info(f"📊 Проанализировано {len(project_files)} файлов")
+        self.logger.info(f"📊 Проанализировано {analysis['total_files']} файлов")
         
     def _scan_project_files(self):
-        """Сканирование файлов проекта"""
-        files = []
+        """Сканирование файлов проекта (генератор, без промежуточного списка)"""
         project_root = Path(__file__).parent.parent
         
-        for file_path in project_root.rglob("*.py"):
-            if file_path.is_file():
-                files.append(str(file_path))
-                
-        return files
+        for file_path in iter_python_files(project_root):
+            yield str(file_path)
         
     def _analyze_code_quality(self, files):
         """Анализ качества кода"""
         analysis = {
-            'total_files': len(files),
+            'total_files': 0,
             'total_lines': 0,
             'complexity_score': 0,
             'maintainability_score': 0,
@@ -277,14 +275,17 @@ class CodeAnalyzerAgent(BaseAgent):
         }
         
         for file_path in files:
+            analysis['total_files'] += 1
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
+                # Для подсчёта строк декодировать UTF-8 не нужно - читаем байты
+                with open(file_path, 'rb') as f:
                     content = f.read()
-                    lines = content.split('\n')
-                    analysis['total_lines'] += len(lines)
+                    # Считаем строки без создания списка строк
+                    line_count = content.count(b'\n') + 1
+                    analysis['total_lines'] += line_count
                     
                     # Простой анализ сложности
-                    if len(lines) > 200:
+                    if line_count > 200:
                         analysis['suggestions'].append({
                             'file': file_path,
                             'type': 'complexity',
@@ -2,7 +2,9 @@
 # Copyright © 2025 <kisa134>
 
 import ast
+import asyncio
 import inspect
+import json
 import os
 import re
 import requests
@@ -13,6 +15,9 @@ import tempfile
 import sys
 from swarm_mind.logger import log_event
 
+# Сколько раз подряд можно отдать прошлые улучшения для того же prompt, прежде чем снова спросить LLM
+IMPROVEMENTS_CACHE_MAX_REUSES = 2
+
 
 class CodeGenerator:
     """
@@ -28,8 +33,15 @@ class CodeGenerator:
     
     def __init__(self, ollama_url: str = "http://localhost:11434", model: str = "deepseek-r1:latest"):
         self.ollama_url = ollama_url
+        self.generate_url = f"{ollama_url}/api/generate"
+        # Одна сессия на экземпляр: keep-alive соединение с Ollama переиспользуется
+        self.session = requests.Session()
         self.model = model
         self.generated_code_history = []
+        # Результаты разбора файлов: путь -> ((mtime_ns, size), анализ)
+        self.file_analysis_cache = {}
+        # Последний запрос улучшений: (prompt, улучшения, сколько раз ещё можно переиспользовать)
+        self.improvements_cache = (None, [], 0)
         
         print("🤖 [CODE-GENERATOR] Initializing autonomous code generation...")
         print("⚡ [CODE-GENERATOR] Ready to write and improve code autonomously!")
@@ -49,19 +61,39 @@ class CodeGenerator:
             'optimization_opportunities': []
         }
         
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    file_analysis = await self.analyze_python_file(file_path)
-                    
-                    analysis['total_files'] += 1
-                    analysis['total_lines'] += file_analysis['lines']
-                    analysis['functions'].extend(file_analysis['functions'])
-                    analysis['classes'].extend(file_analysis['classes'])
-                    analysis['imports'].update(file_analysis['imports'])
-                    analysis['complexity_score'] += file_analysis['complexity']
-                    analysis['technical_debt'].extend(file_analysis['debt'])
+        python_files = [os.path.join(root, file)
+                        for root, dirs, files in os.walk(directory)
+                        for file in files if file.endswith('.py')]
+        
+        for file_path in python_files:
+            # Файл не менялся с прошлого цикла эволюции - повторно не парсим
+            try:
+                stat = os.stat(file_path)
+            except OSError as e:
+                # Файл удалён между обходом каталога и stat - пропускаем только его
+                print(f"❌ [ANALYSIS] Error analyzing {file_path}: {e}")
+                continue
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            cached = self.file_analysis_cache.get(file_path)
+            if cached and cached[0] == stamp:
+                file_analysis = cached[1]
+            else:
+                file_analysis = await self.analyze_python_file(file_path)
+                self.file_analysis_cache[file_path] = (stamp, file_analysis)
+            
+            analysis['total_files'] += 1
+            analysis['total_lines'] += file_analysis['lines']
+            analysis['functions'].extend(file_analysis['functions'])
+            analysis['classes'].extend(file_analysis['classes'])
+            analysis['imports'].update(file_analysis['imports'])
+            analysis['complexity_score'] += file_analysis['complexity']
+            analysis['technical_debt'].extend(file_analysis['debt'])
+        
+        # Удалённые и переименованные файлы больше не держим в кэше
+        current_files = set(python_files)
+        if self.file_analysis_cache.keys() != current_files:
+            self.file_analysis_cache = {path: entry for path, entry in self.file_analysis_cache.items()
+                                        if path in current_files}
         
         print(f"📊 [ANALYSIS] Found {analysis['total_files']} files, {analysis['total_lines']} lines")
         print(f"🏗️ [ANALYSIS] {len(analysis['functions'])} functions, {len(analysis['classes'])} classes")
@@ -78,7 +110,7 @@ class CodeGenerator:
             
             analysis = {
                 'file_path': file_path,
-                'lines': len(source_code.split('\n')),
+                'lines': source_code.count('\n') + 1,
                 'functions': [],
                 'classes': [],
                 'imports': [],
@@ -188,19 +220,28 @@ Respond in JSON format:
 }}
 """
         
+        # Prompt строится только из агрегированных счётчиков - если он совпал, используем прошлый ответ,
+        # но не дольше IMPROVEMENTS_CACHE_MAX_REUSES раз, чтобы эволюция не застыла на одном ответе LLM
+        cached_prompt, cached_improvements, reuses_left = self.improvements_cache
+        if prompt == cached_prompt and reuses_left > 0:
+            self.improvements_cache = (cached_prompt, cached_improvements, reuses_left - 1)
+            print(f"♻️ [AI-CODING] Prompt unchanged, reusing {len(cached_improvements)} improvements")
+            return list(cached_improvements)
+        
         try:
             response = await self.call_ollama(prompt)
             
             # Парсим JSON ответ
-            import re
             json_match = re.search(r'\{.*\}', response, re.DOTALL)
             if json_match:
-                import json
                 improvements_data = json.loads(json_match.group())
+                improvements = improvements_data.get('improvements', [])
                 
-                print(f"💡 [AI-CODING] Generated {len(improvements_data.get('improvements', []))} code improvements")
+                print(f"💡 [AI-CODING] Generated {len(improvements)} code improvements")
                 log_event('CodeGenerator: generated code improvements')
-                return improvements_data.get('improvements', [])
+                if improvements:
+                    self.improvements_cache = (prompt, list(improvements), IMPROVEMENTS_CACHE_MAX_REUSES)
+                return improvements
                 
         except Exception as e:
             print(f"❌ [AI-CODING] Error generating improvements: {e}")
@@ -294,8 +335,8 @@ Return ONLY the optimized Python code:
         }
         
         try:
-            # 1. Проверка синтаксиса
-            ast.parse(code)
+            # 1. Проверка синтаксиса (дерево переиспользуем в статическом анализе)
+            tree = ast.parse(code)
             test_results['syntax_valid'] = True
             test_results['score'] += 25
             print("✅ [TESTING] Syntax is valid")
@@ -328,18 +369,17 @@ Return ONLY the optimized Python code:
             
             # 3. Статический анализ
             if test_results['syntax_valid']:
-                tree = ast.parse(code)
-                
-                # Проверяем на наличие docstrings
-                functions = [node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
-                classes = [node for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
-                
-                documented_funcs = sum(1 for func in functions if ast.get_docstring(func))
-                documented_classes = sum(1 for cls in classes if ast.get_docstring(cls))
+                # Проверяем на наличие docstrings - один проход по дереву
+                total_items = 0
+                documented_items = 0
+                for node in ast.walk(tree):
+                    if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+                        total_items += 1
+                        if ast.get_docstring(node):
+                            documented_items += 1
                 
-                total_items = len(functions) + len(classes)
                 if total_items > 0:
-                    doc_score = (documented_funcs + documented_classes) / total_items * 25
+                    doc_score = documented_items / total_items * 25
                     test_results['score'] += doc_score
                 
                 # Бонус за type hints
@@ -397,8 +437,10 @@ Return ONLY the optimized Python code:
                 }
             }
             
-            response = requests.post(
-                f"{self.ollama_url}/api/generate",
+            # Блокирующий HTTP-запрос выполняем в отдельном потоке, не останавливая event loop
+            response = await asyncio.to_thread(
+                self.session.post,
+                self.generate_url,
                 json=payload,
                 timeout=60  # Больше времени для генерации кода
             )
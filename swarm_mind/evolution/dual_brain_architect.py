@@ -22,6 +22,7 @@
 import asyncio
 import json
 import os
+import re
 import time
 import requests
 import subprocess
@@ -82,6 +83,9 @@ class DualBrainArchitect:
     
     def __init__(self, ollama_url: str = "http://localhost:11434"):
         self.ollama_url = ollama_url
+        self.generate_url = f"{ollama_url}/api/generate"
+        # Одна сессия на экземпляр: keep-alive соединение с Ollama переиспользуется
+        self.session = requests.Session()
         
         # Конфигурация мозгов
         self.strategist_model = "llama3:latest"  # Можно заменить на Mixtral
@@ -214,7 +218,6 @@ Respond ONLY in this JSON format:
             response = await self.call_ollama(self.strategist_model, prompt)
             
             # Парсим стратегический анализ
-            import re
             json_match = re.search(r'\{.*\}', response, re.DOTALL)
             if json_match:
                 analysis_data = json.loads(json_match.group())
@@ -299,7 +302,6 @@ Return ONLY the complete Python code for the file:
             response = await self.call_ollama(self.engineer_model, prompt, temperature=0.1, max_tokens=4000)
             
             # Извлекаем код
-            import re
             code_match = re.search(r'```python\n(.*?)```', response, re.DOTALL)
             if code_match:
                 new_code = code_match.group(1).strip()
@@ -461,8 +463,10 @@ Return ONLY the complete Python code for the file:
     async def gather_system_metrics(self) -> Dict:
         """Сбор системных метрик"""
         import psutil
+        
+        # cpu_percent(interval=1) спит секунду - замер идёт в потоке, а не в event loop
         return {
-            "cpu_percent": psutil.cpu_percent(interval=1),
+            "cpu_percent": await asyncio.to_thread(psutil.cpu_percent, interval=1),
             "memory_percent": psutil.virtual_memory().percent,
             "disk_usage": psutil.disk_usage('.').percent
         }
@@ -507,8 +511,10 @@ Return ONLY the complete Python code for the file:
                 }
             }
             
-            response = requests.post(
-                f"{self.ollama_url}/api/generate",
+            # requests синхронный - запрос уходит в пул потоков, event loop не ждёт
+            response = await asyncio.to_thread(
+                self.session.post,
+                self.generate_url,
                 json=payload,
                 timeout=120  # Увеличенный timeout для сложных задач
             )
@@ -528,25 +534,31 @@ class DualBrainLogAnalyzer:
         self.insights = []
         self.running = False
         self.thread = None
+        self.stop_event = threading.Event()
 
     def start(self):
         if not self.running:
             self.running = True
-            self.thread = threading.Thread(target=self.analyze_loop, daemon=True)
+            # Своё событие на каждый поток: поток, остановленный прошлым stop(),
+            # не продолжит работу после повторного start()
+            self.stop_event = threading.Event()
+            self.thread = threading.Thread(target=self.analyze_loop, args=(self.stop_event,), daemon=True)
             self.thread.start()
             log_event('DualBrainLogAnalyzer started')
 
     def stop(self):
         self.running = False
+        self.stop_event.set()  # Будим поток анализа, чтобы он завершился сразу
         log_event('DualBrainLogAnalyzer stopped')
 
-    def analyze_loop(self):
-        while self.running:
+    def analyze_loop(self, stop_event):
+        while not stop_event.is_set():
             log_lines = swarm_logger.get_recent_events(200)
             new_insights = self.analyze_log(log_lines)
             if new_insights:
                 self.insights.extend(new_insights)
-            time.sleep(30)
+            # Пауза 30 секунд, прерываемая вызовом stop()
+            stop_event.wait(30)
 
     def analyze_log(self, log_lines):
         insights = []
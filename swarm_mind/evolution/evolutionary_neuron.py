@@ -1,6 +1,7 @@
 # The MIT License (MIT)
 # Copyright © 2025 <kisa134>
 
+import argparse
 import asyncio
 import json
 import time
@@ -28,12 +29,12 @@ class EvolutionaryNeuron(BaseNeuron):
     def __init__(self, config=None):
         # Создаем простой конфиг без парсинга аргументов для эволюционного нейрона
         if config is None:
-            import argparse
-            config = argparse.Namespace()
-            config.neuron = argparse.Namespace()
-            config.neuron.name = "EvolutionEngine"
-            config.neuron.log_level = "INFO"
-            config.neuron.p2p_port = 6881
+            # Namespace, а не dataclass: BaseNeuron.merge_configs обходит конфиг через vars()
+            config = argparse.Namespace(neuron=argparse.Namespace(
+                name="EvolutionEngine",
+                log_level="INFO",
+                p2p_port=6881
+            ))
         
         super().__init__(config=config)
         self.evolution_active = False
@@ -74,10 +75,10 @@ class EvolutionaryNeuron(BaseNeuron):
                 print(f"\n🧬 [CYCLE {self.evolution_cycles + 1}] Starting new evolution cycle...")
                 
                 # 1. АНАЛИЗ ТЕКУЩЕГО СОСТОЯНИЯ
-                await self.analyze_current_state()
+                performance_analysis, codebase_analysis = await self.analyze_current_state()
                 
-                # 2. ГЕНЕРАЦИЯ УЛУЧШЕНИЙ
-                await self.generate_evolutionary_improvements()
+                # 2. ГЕНЕРАЦИЯ УЛУЧШЕНИЙ (на основе уже собранного анализа)
+                await self.generate_evolutionary_improvements(performance_analysis, codebase_analysis)
                 
                 # 3. ПРИМЕНЕНИЕ ИЗМЕНЕНИЙ
                 await self.apply_safe_improvements()
@@ -133,13 +134,13 @@ class EvolutionaryNeuron(BaseNeuron):
         """Глубокий анализ текущего состояния системы"""
         print("🔍 [ANALYSIS] Performing deep system analysis...")
         
-        # Анализ производительности
-        current_metrics = await self.self_improver.collect_performance_metrics()
+        # Метрики (ждут секундный замер CPU) и анализ кода независимы - собираем параллельно
+        current_metrics, codebase_analysis = await asyncio.gather(
+            self.self_improver.collect_performance_metrics(),
+            self.code_generator.analyze_codebase()
+        )
         performance_trend = await self.self_improver.analyze_performance_trends()
         
-        # Анализ кода
-        codebase_analysis = await self.code_generator.analyze_codebase()
-        
         # Сравнение с базовой линией
         if self.performance_baseline:
             baseline_success = self.performance_baseline['metrics'].success_rate
@@ -150,26 +151,34 @@ class EvolutionaryNeuron(BaseNeuron):
             
         print(f"🧠 [STATE] Current system complexity: {codebase_analysis['complexity_score']}")
         print(f"🔧 [DEBT] Technical debt items: {len(codebase_analysis['technical_debt'])}")
+        
+        return performance_trend, codebase_analysis
     
-    async def generate_evolutionary_improvements(self):
+    async def generate_evolutionary_improvements(self, performance_analysis: Dict = None, codebase_analysis: Dict = None):
         """Генерация эволюционных улучшений"""
         print("🧠 [AI-EVOLUTION] Generating next-generation improvements...")
         
-        # Получаем анализ от обеих систем
-        performance_analysis = await self.self_improver.analyze_performance_trends()
-        codebase_analysis = await self.code_generator.analyze_codebase()
+        # Анализ от обеих систем: берём из текущего цикла, если он уже собран
+        if performance_analysis is None:
+            performance_analysis = await self.self_improver.analyze_performance_trends()
+        if codebase_analysis is None:
+            codebase_analysis = await self.code_generator.analyze_codebase()
         
-        # Генерируем улучшения производительности
+        # Запросы к LLM за улучшениями производительности и кода независимы - выполняем параллельно
         if performance_analysis['needs_improvement']:
-            performance_suggestions = await self.self_improver.generate_improvements(performance_analysis)
+            performance_suggestions, code_improvements = await asyncio.gather(
+                self.self_improver.generate_improvements(performance_analysis),
+                self.code_generator.generate_code_improvements(codebase_analysis)
+            )
             print(f"⚡ [PERF-IMPROVE] Generated {len(performance_suggestions)} performance improvements")
+        else:
+            performance_suggestions = []
+            code_improvements = await self.code_generator.generate_code_improvements(codebase_analysis)
         
-        # Генерируем улучшения кода
-        code_improvements = await self.code_generator.generate_code_improvements(codebase_analysis)
         print(f"🤖 [CODE-IMPROVE] Generated {len(code_improvements)} code improvements")
         
         # Объединяем все улучшения
-        total_improvements = len(performance_suggestions if performance_analysis['needs_improvement'] else []) + len(code_improvements)
+        total_improvements = len(performance_suggestions) + len(code_improvements)
         print(f"💡 [TOTAL] {total_improvements} improvements ready for evaluation")
     
     async def apply_safe_improvements(self):
@@ -6,6 +6,7 @@ import json
 import time
 import subprocess
 import os
+import re
 import requests
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
@@ -53,6 +54,9 @@ class SelfImprover:
     
     def __init__(self, ollama_url: str = "http://localhost:11434", model: str = "deepseek-r1:latest"):
         self.ollama_url = ollama_url
+        self.generate_url = f"{ollama_url}/api/generate"
+        # Одна сессия на экземпляр: keep-alive соединение с Ollama переиспользуется
+        self.session = requests.Session()
         self.model = model
         self.metrics_history: List[PerformanceMetrics] = []
         self.improvement_queue: List[ImprovementSuggestion] = []
@@ -101,7 +105,8 @@ class SelfImprover:
         
         # Базовые системные метрики
         memory_usage = psutil.virtual_memory().percent
-        cpu_usage = psutil.cpu_percent(interval=1)
+        # Секундный замер CPU - в потоке, чтобы параллельные корутины не простаивали
+        cpu_usage = await asyncio.to_thread(psutil.cpu_percent, interval=1)
         
         # Метрики сети (симуляция)
         network_latency = await self.measure_network_latency()
@@ -200,7 +205,6 @@ Respond in JSON format:
             response = await self.call_ollama(prompt)
             
             # Парсим JSON ответ
-            import re
             json_match = re.search(r'\{.*\}', response, re.DOTALL)
             if json_match:
                 improvements_data = json.loads(json_match.group())
@@ -298,8 +302,9 @@ Respond in JSON format:
                 }
             }
             
-            response = requests.post(
-                f"{self.ollama_url}/api/generate",
+            response = await asyncio.to_thread(
+                self.session.post,
+                self.generate_url,
                 json=payload,
                 timeout=30
             )
@@ -13,28 +13,42 @@
 
 import asyncio
 import json
+import multiprocessing
 import os
 import subprocess
 import tempfile
 import shutil
+import threading
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import logging
 import requests
 import ast
+from concurrent.futures import ProcessPoolExecutor
 import astor
 
+from swarm_mind.project_files import iter_python_files
+
 # Настройка логирования
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("GitHubSelfImprovement")
 
+# С какого числа изменённых файлов разбор окупает запуск пула процессов
+PROCESS_POOL_MIN_FILES = 64
+
 class CodeAnalyzerAgent:
     """Агент анализа кода - первый уровень"""
     
     def __init__(self, project_root: str = None):
         self.project_root = Path(project_root) if project_root else Path(__file__).parent.parent
         self.analysis_results = []
+        # Кэш результатов анализа: путь -> ((mtime_ns, size), результат)
+        self.file_cache = {}
+        # Пул процессов создаётся лениво - только для больших кодовых баз.
+        # Останавливают его из другого потока (запрос веб-интерфейса), поэтому доступ под блокировкой
+        self.process_pool = None
+        self.pool_lock = threading.Lock()
         
     async def analyze_entire_codebase(self) -> Dict[str, Any]:
         """Полный анализ кодовой базы"""
@@ -52,11 +66,56 @@ class CodeAnalyzerAgent:
         }
         
         # Сканируем все Python файлы
-        python_files = list(self.project_root.rglob("*.py"))
+        python_files = list(iter_python_files(self.project_root))
         analysis['total_files'] = len(python_files)
         
+        # Неизменённые с прошлого цикла файлы берём из кэша
+        file_analyses = []
+        changed_files = []
         for file_path in python_files:
-            file_analysis = await self.analyze_file(file_path)
+            try:
+                stat = file_path.stat()
+            except OSError as e:
+                # Файл удалён или переписан между обходом каталога и stat - пропускаем
+                logger.error(f"❌ Ошибка анализа файла {file_path}: {e}")
+                continue
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            cached = self.file_cache.get(file_path)
+            if cached and cached[0] == stamp:
+                file_analyses.append(cached[1])
+            else:
+                changed_files.append((file_path, stamp))
+        
+        # Разбор AST не должен блокировать event loop. Небольшой набор файлов
+        # разбираем в потоке: запуск процессов обошёлся бы дороже самого анализа
+        if changed_files:
+            paths = [str(file_path) for file_path, _ in changed_files]
+            if len(paths) >= PROCESS_POOL_MIN_FILES:
+                loop = asyncio.get_running_loop()
+                with self.pool_lock:
+                    if self.process_pool is None:
+                        # spawn, а не fork: процесс уже многопоточный (потоки веб-сервера)
+                        self.process_pool = ProcessPoolExecutor(
+                            max_workers=min(len(paths), os.cpu_count() or 1),
+                            mp_context=multiprocessing.get_context('spawn'))
+                    futures = [loop.run_in_executor(self.process_pool, self.analyze_file, path)
+                               for path in paths]
+                fresh_analyses = await asyncio.gather(*futures)
+            else:
+                fresh_analyses = await asyncio.to_thread(
+                    lambda: [self.analyze_file(path) for path in paths])
+            
+            for (file_path, stamp), file_analysis in zip(changed_files, fresh_analyses):
+                self.file_cache[file_path] = (stamp, file_analysis)
+            file_analyses.extend(fresh_analyses)
+        
+        # Удалённые файлы больше не держим в кэше
+        current_files = set(python_files)
+        if self.file_cache.keys() != current_files:
+            self.file_cache = {path: entry for path, entry in self.file_cache.items()
+                               if path in current_files}
+        
+        for file_analysis in file_analyses:
             analysis['total_lines'] += file_analysis['lines']
             analysis['complexity_score'] += file_analysis['complexity']
             
@@ -68,13 +127,23 @@ class CodeAnalyzerAgent:
             if file_analysis['suggestions']:
                 analysis['improvement_suggestions'].extend(file_analysis['suggestions'])
         
-        logger.info(f"✅ CodeAnalyzerAgent: Проанализировано {analysis['total_files']} файлов")
+        logger.info(f"✅ CodeAnalyzerAgent: Проанализировано {analysis['total_files']} файлов "
+                    f"(изменено: {len(changed_files)})")
         logger.info(f"📊 CodeAnalyzerAgent: Найдено {len(analysis['improvement_suggestions'])} предложений по улучшению")
         
         return analysis
     
-    async def analyze_file(self, file_path: Path) -> Dict[str, Any]:
-        """Анализ отдельного файла"""
+    def shutdown(self):
+        """Остановка пула процессов анализа (не блокирует вызывающий поток)"""
+        with self.pool_lock:
+            pool, self.process_pool = self.process_pool, None
+        if pool is not None:
+            # Ожидающие задачи отменяются, в analyze_entire_codebase это приходит как CancelledError
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    @staticmethod
+    def analyze_file(file_path: str) -> Dict[str, Any]:
+        """Анализ отдельного файла (может выполняться в дочернем процессе)"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
@@ -83,7 +152,7 @@ class CodeAnalyzerAgent:
             
             analysis = {
                 'file_path': str(file_path),
-                'lines': len(content.split('\n')),
+                'lines': content.count('\n') + 1,
                 'complexity': 0,
                 'issues': [],
                 'suggestions': []
@@ -92,7 +161,7 @@ class CodeAnalyzerAgent:
             # Анализируем сложность
             for node in ast.walk(tree):
                 if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    complexity = self.calculate_complexity(node)
+                    complexity = CodeAnalyzerAgent.calculate_complexity(node)
                     analysis['complexity'] += complexity
                     
                     # Проверяем на проблемы
@@ -125,7 +194,7 @@ class CodeAnalyzerAgent:
                 })
             
             # Проверяем на неиспользуемые импорты
-            unused_imports = self.find_unused_imports(tree, content)
+            unused_imports = CodeAnalyzerAgent.find_unused_imports(tree, content)
             if unused_imports:
                 analysis['suggestions'].append({
                     'type': 'remove_unused_imports',
@@ -147,7 +216,8 @@ class CodeAnalyzerAgent:
                 'suggestions': []
             }
     
-    def calculate_complexity(self, node: ast.AST) -> int:
+    @staticmethod
+    def calculate_complexity(node: ast.AST) -> int:
         """Вычисление цикломатической сложности"""
         complexity = 1
         
@@ -161,7 +231,8 @@ class CodeAnalyzerAgent:
                 
         return complexity
     
-    def find_unused_imports(self, tree: ast.AST, content: str) -> List[str]:
+    @staticmethod
+    def find_unused_imports(tree: ast.AST, content: str) -> List[str]:
         """Поиск неиспользуемых импортов"""
         # Простая проверка - в реальной системе нужен более сложный анализ
         return []
@@ -399,6 +470,9 @@ class GitHubSelfImprovementSystem:
                 # 1. Анализ кода
                 logger.info("🔍 Этап 1: Анализ кода")
                 analysis = await self.analyzer.analyze_entire_codebase()
+                if not self.running:
+                    # Цикл остановили, пока шёл анализ - ветки и PR уже не создаём
+                    break
                 
                 if not analysis['improvement_suggestions']:
                     logger.info("✅ Нет предложений по улучшению")
@@ -421,6 +495,12 @@ class GitHubSelfImprovementSystem:
                 # Ждем перед следующим циклом
                 await asyncio.sleep(600)  # 10 минут
                 
+            except asyncio.CancelledError:
+                if self.running:
+                    raise
+                # Анализ прерван stop_improvement_cycle: задачи пула процессов отменены
+                logger.info("🛑 Анализ кода прерван остановкой цикла")
+                break
             except Exception as e:
                 logger.error(f"❌ Ошибка в цикле самоулучшения: {e}")
                 await asyncio.sleep(300)
@@ -429,6 +509,7 @@ class GitHubSelfImprovementSystem:
         """Остановка цикла самоулучшения"""
         logger.info("🛑 GitHubSelfImprovementSystem: Остановка цикла самоулучшения")
         self.running = False
+        self.analyzer.shutdown()
 
 # Функции для интеграции с основной системой
 async def start_github_self_improvement():
@@ -1,19 +1,15 @@
 import logging
 import sys
-import os
+
+# Общий форматтер для всех логгеров (одинаков для Windows и остальных ОС)
+LOG_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
 
 def setup_logger(name, level=logging.INFO):
     """Настройка логгера с поддержкой Windows"""
     
-    # Создаем форматтер без эмодзи для Windows
-    if os.name == 'nt':  # Windows
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-    else:
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+    formatter = LOG_FORMATTER
     
     # Создаем логгер
     logger = logging.getLogger(name)
@@ -0,0 +1,14 @@
+import os
+from pathlib import Path
+
+# Каталоги окружений и артефактов сборки - их код не анализируем и не улучшаем
+EXCLUDED_DIRS = {'venv', '.venv', 'env', 'site-packages', '__pycache__', 'build', 'dist', '.git'}
+
+def iter_python_files(root):
+    """Python файлы проекта (генератор); в исключённые каталоги обход не заходит"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        # Список правим на месте - так os.walk не спускается в исключённые каталоги
+        dirnames[:] = [name for name in dirnames if name not in EXCLUDED_DIRS]
+        for filename in filenames:
+            if filename.endswith('.py'):
+                yield Path(dirpath) / filename
@@ -3,6 +3,7 @@
 
 import asyncio
 import json
+import re
 import requests
 from swarm_mind.validators.base_validator import BaseValidator
 from swarm_mind.task import SquareTask
@@ -39,11 +40,14 @@ class LLMValidator(BaseValidator):
                 print(f"[{self.config.neuron.name}] Using Docker bridge network")
         except Exception:
             self.ollama_base_url = "http://localhost:11434"
+        self.generate_url = f"{self.ollama_base_url}/api/generate"
         self.model_name = "llama3:latest"  # Using Llama3 - good balance of power and instruction following
+        # Reuse one keep-alive connection to Ollama instead of reconnecting per request
+        self.session = requests.Session()
         
         # Test connection to Ollama
         try:
-            response = requests.get(f"{self.ollama_base_url}/api/version", timeout=5)
+            response = self.session.get(f"{self.ollama_base_url}/api/version", timeout=5)
             if response.status_code == 200:
                 print(f"[{self.config.neuron.name}] Connected to Ollama {response.json().get('version')}")
             else:
@@ -69,8 +73,8 @@ class LLMValidator(BaseValidator):
                 }
             }
             
-            response = requests.post(
-                f"{self.ollama_base_url}/api/generate", 
+            response = self.session.post(
+                self.generate_url, 
                 json=payload, 
                 timeout=30
             )
@@ -105,7 +109,6 @@ Replace 42 with any integer between 1-100. Output ONLY the JSON, no thinking, no
                 raise Exception("Empty Ollama response")
             
             # Extract JSON from response (handle DeepSeek thinking tags)
-            import re
             json_match = re.search(r'\{[^}]*"number"[^}]*\}', llm_response)
             if json_match:
                 json_str = json_match.group()
@@ -12,16 +12,19 @@ import time
 import threading
 import sys
 import os
+from collections import deque
 from datetime import datetime
+from itertools import islice
 from typing import Dict, List, Optional, Any
 import logging
 from pathlib import Path
 
 # Добавляем путь к проекту для импортов
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
-from flask import Flask, render_template_string, jsonify, request, Response
+from flask import Flask, render_template, jsonify, request, Response
 from flask_socketio import SocketIO, emit, join_room, leave_room
 import psutil
 
@@ -70,7 +73,8 @@ class SwarmMindNetwork:
     
     def __init__(self):
         self.nodes = {}  # Активные ноды в сети
-        self.messages = []  # Сообщения в чате
+        self.active_node_ids = set()  # Индекс активных нод (без пересчета по всем нодам)
+        self.messages = deque(maxlen=1000)  # Сообщения в чате (кольцевой буфер)
         self.core = None  # Ядро системы
         self.interface = None  # Интерфейс общения
         self.code_modifier = None  # Модификатор кода
@@ -91,36 +95,38 @@ class SwarmMindNetwork:
             'consciousness_level': 0.0,
             'evolution_cycles': 0
         }
+        self.active_node_ids.add(node_id)
         self.network_stats['total_nodes'] = len(self.nodes)
-        self.network_stats['active_nodes'] = len([n for n in self.nodes.values() if n['status'] == 'active'])
+        self.network_stats['active_nodes'] = len(self.active_node_ids)
         
     def remove_node(self, node_id: str):
         """Удаление ноды из сети"""
         if node_id in self.nodes:
             self.nodes[node_id]['status'] = 'inactive'
-            self.network_stats['active_nodes'] = len([n for n in self.nodes.values() if n['status'] == 'active'])
+            self.active_node_ids.discard(node_id)
+            self.network_stats['active_nodes'] = len(self.active_node_ids)
             
     def add_message(self, message: Dict[str, Any]):
         """Добавление сообщения в чат"""
+        # deque с maxlen сам вытесняет старые сообщения без копирования списка
         self.messages.append(message)
         self.network_stats['total_messages'] = len(self.messages)
-        
-        # Ограничиваем количество сообщений
-        if len(self.messages) > 1000:
-            self.messages = self.messages[-500:]
             
     def get_network_status(self) -> Dict[str, Any]:
         """Получение статуса сети"""
         return {
             'stats': self.network_stats,
             'nodes': list(self.nodes.values()),
-            'recent_messages': self.messages[-50:] if self.messages else []
+            'recent_messages': list(islice(self.messages, max(0, len(self.messages) - 50), None))
         }
 
 # Глобальные объекты
 network = SwarmMindNetwork()
 core = None
 interface = None
+background_loop = None  # Event loop фонового потока эволюции
+background_thread = None
+background_tasks = set()  # Сильные ссылки на задачи, запущенные командами из UI
 
 def init_swarmmind():
     """Инициализация SwarmMind"""
@@ -152,13 +158,14 @@ def init_swarmmind():
 
 def start_background_tasks():
     """Запуск фоновых задач"""
+    global background_loop, background_thread
     
-    def evolution_loop():
+    async def evolution_loop():
         """Цикл эволюции"""
         while True:
             try:
                 if core and core.is_running:
-                    asyncio.run(core.evolve())
+                    await core.evolve()
                     
                     # Обновляем статус ноды в сети
                     if core.node_id in network.nodes:
@@ -175,17 +182,57 @@ def start_background_tasks():
                             'evolution_cycles': core.evolution_cycles
                         })
                         
-                time.sleep(30)  # Эволюция каждые 30 секунд
+                await asyncio.sleep(30)  # Эволюция каждые 30 секунд
             except Exception as e:
                 logger.error(f"❌ Ошибка в цикле эволюции: {e}")
-                time.sleep(60)
+                await asyncio.sleep(60)
+    
+    def run_background_loop(loop):
+        """Единый event loop на все время жизни фонового потока"""
+        # Работаем только с переданным loop: глобальную переменную stop_background_tasks может уже сбросить
+        asyncio.set_event_loop(loop)
+        loop.create_task(evolution_loop())
+        try:
+            loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
     
     # Запускаем фоновые задачи
-    evolution_thread = threading.Thread(target=evolution_loop, daemon=True)
-    evolution_thread.start()
+    background_loop = asyncio.new_event_loop()
+    background_thread = threading.Thread(target=run_background_loop, args=(background_loop,), daemon=True)
+    background_thread.start()
     
     logger.info("✅ Фоновые задачи запущены")
 
+def spawn_background_task(coro):
+    """Запуск корутины в фоновом loop (вызывается внутри loop)"""
+    # Loop хранит на задачи только слабые ссылки - держим их до завершения
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+def stop_background_tasks():
+    """Остановка фонового event loop: задачи отменяются, loop закрывается"""
+    global background_loop, background_thread
+    
+    if background_loop is None:
+        return
+    
+    background_loop.call_soon_threadsafe(background_loop.stop)
+    background_thread.join(timeout=10)
+    if background_thread.is_alive():
+        # Текущий шаг эволюции ещё не отдал управление - loop остановится и закроется сам после него
+        logger.warning("⚠️ Фоновый поток не остановился за 10 секунд")
+        return
+    background_loop = None
+    background_thread = None
+    
+    logger.info("🛑 Фоновые задачи остановлены")
+
 # HTML шаблон для интерфейса
 HTML_TEMPLATE = '''
 <!DOCTYPE html>
@@ -585,12 +632,31 @@ HTML_TEMPLATE = '''
             addLogMessage(data.level, data.message);
         });
         
+        // Лимиты DOM: старые записи удаляются, чтобы страница не росла бесконечно
+        const MAX_CHAT_MESSAGES = 200;
+        const MAX_LOG_ENTRIES = 500;
+        
+        function trimChildren(container, limit) {
+            while (container.childElementCount > limit) {
+                container.removeChild(container.firstElementChild);
+            }
+        }
+        
+        // Запись в DOM только при изменении значения
+        function setText(id, value) {
+            const element = document.getElementById(id);
+            const text = String(value);
+            if (element.textContent !== text) {
+                element.textContent = text;
+            }
+        }
+        
         // Обновление статуса системы
         function updateSystemStatus(data) {
-            document.getElementById('consciousness-level').textContent = data.consciousness_level.toFixed(1) + '%';
-            document.getElementById('evolution-cycles').textContent = data.evolution_cycles;
-            document.getElementById('network-nodes').textContent = data.network_stats.active_nodes;
-            document.getElementById('total-messages').textContent = data.network_stats.total_messages;
+            setText('consciousness-level', data.consciousness_level.toFixed(1) + '%');
+            setText('evolution-cycles', data.evolution_cycles);
+            setText('network-nodes', data.network_stats.active_nodes);
+            setText('total-messages', data.network_stats.total_messages);
         }
         
         // Обновление статуса ноды
@@ -614,6 +680,7 @@ HTML_TEMPLATE = '''
             `;
             
             chatContainer.appendChild(messageDiv);
+            trimChildren(chatContainer, MAX_CHAT_MESSAGES);
             chatContainer.scrollTop = chatContainer.scrollHeight;
         }
         
@@ -631,6 +698,7 @@ HTML_TEMPLATE = '''
             `;
             
             logContainer.appendChild(logEntry);
+            trimChildren(logContainer, MAX_LOG_ENTRIES);
             logContainer.scrollTop = logContainer.scrollHeight;
         }
         
@@ -688,10 +756,13 @@ HTML_TEMPLATE = '''
 </html>
 '''
 
+# Шаблон компилируется один раз при загрузке модуля, а не на каждый запрос
+INDEX_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE)
+
 @app.route('/')
 def index():
     """Главная страница"""
-    return render_template_string(HTML_TEMPLATE)
+    return render_template(INDEX_TEMPLATE)
 
 @app.route('/api/status')
 def get_status():
@@ -825,8 +896,9 @@ def handle_command(data):
         command_type = data.get('type')
         
         if command_type == 'start_evolution':
-            if core:
-                asyncio.create_task(core.evolve())
+            if core and background_loop:
+                # Fire-and-forget: результат не нужен, поэтому без run_coroutine_threadsafe
+                background_loop.call_soon_threadsafe(spawn_background_task, core.evolve())
                 emit('log_message', {'level': 'INFO', 'message': 'Эволюция запущена'})
                 
         elif command_type == 'analyze_code':
@@ -877,8 +949,11 @@ def main():
     print("🧬 Эволюция запущена в фоне")
     print("=" * 60)
     
-    # Запускаем веб-сервер
-    socketio.run(app, host='0.0.0.0', port=5000, debug=False)
+    # Запускаем веб-сервер; после его остановки гасим фоновый loop
+    try:
+        socketio.run(app, host='0.0.0.0', port=5000, debug=False)
+    finally:
+        stop_background_tasks()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -9,10 +9,15 @@ import time
 import json
 import threading
 import asyncio
-from datetime import datetime
-from flask import Flask, render_template_string, jsonify, request
+from flask import Flask, render_template, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Настройка логирования для Windows
 logging.basicConfig(
     level=logging.INFO,
@@ -26,6 +31,51 @@ logger = logging.getLogger("WorkingSwarmMind")
 
 app = Flask(__name__)
 
+if orjson is not None:
+    class OrjsonProvider(DefaultJSONProvider):
+        """Сериализация ответов API через orjson вместо стандартного json"""
+        
+        def _options(self, indent=False):
+            # Не-строковые ключи словарей допускаем, как и стандартный json;
+            # datetime и dataclass отдаем в self.default, чтобы формат совпадал с Flask
+            option = (orjson.OPT_NON_STR_KEYS
+                      | orjson.OPT_PASSTHROUGH_DATETIME
+                      | orjson.OPT_PASSTHROUGH_DATACLASS)
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return option
+        
+        def dumps(self, obj, **kwargs):
+            # orjson понимает только indent - с остальными параметрами работает стандартный провайдер
+            if set(kwargs) <= {'indent'}:
+                try:
+                    option = self._options(indent=kwargs.get('indent'))
+                    return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+                except TypeError:
+                    # Например, целые больше 64 бит - их сериализует стандартный json
+                    pass
+            return super().dumps(obj, **kwargs)
+        
+        def response(self, *args, **kwargs):
+            # Байты orjson отдаем в ответ как есть, без декодирования в str и обратно
+            obj = self._prepare_response_obj(args, kwargs)
+            indent = (self.compact is None and self._app.debug) or self.compact is False
+            try:
+                body = orjson.dumps(obj, default=self.default, option=self._options(indent=indent))
+            except TypeError:
+                return super().response(*args, **kwargs)
+            return self._app.response_class(body, mimetype=self.mimetype)
+    
+    app.json = OrjsonProvider(app)
+
+# Формат времени сообщений чата
+TIME_FORMAT = '%H:%M:%S'
+
+# Сколько последних сообщений чата хранить в памяти
+MAX_CHAT_MESSAGES = 200
+
 class WorkingSwarmMind:
     """Рабочая система SwarmMind без проблем"""
     
@@ -39,6 +89,8 @@ class WorkingSwarmMind:
         self.network_nodes = 1
         self.total_messages = 0
         self.chat_messages = []
+        # Сериализованный ответ /api/messages: (total_messages, тело ответа)
+        self.messages_cache = (None, '')
         
         # Компоненты системы
         self.components = {
@@ -81,10 +133,12 @@ class WorkingSwarmMind:
     
     def add_message(self, content):
         """Добавление сообщения в чат"""
+        # Вопрос и ответ обрабатываются за один вызов - время форматируем один раз
+        timestamp = time.strftime(TIME_FORMAT)
         message = {
             'id': self.total_messages + 1,
             'content': content,
-            'timestamp': datetime.now().strftime('%H:%M:%S'),
+            'timestamp': timestamp,
             'sender': 'User'
         }
         self.chat_messages.append(message)
@@ -95,12 +149,16 @@ class WorkingSwarmMind:
         response_msg = {
             'id': self.total_messages + 1,
             'content': response,
-            'timestamp': datetime.now().strftime('%H:%M:%S'),
+            'timestamp': timestamp,
             'sender': 'SwarmMind'
         }
         self.chat_messages.append(response_msg)
         self.total_messages += 1
         
+        # Ограничиваем историю чата
+        if len(self.chat_messages) > MAX_CHAT_MESSAGES:
+            del self.chat_messages[:-MAX_CHAT_MESSAGES]
+        
         logger.info(f"Новое сообщение: {content}")
         return response
     
@@ -368,14 +426,8 @@ HTML_TEMPLATE = '''
         
         <div class="chat-container">
             <h3>Чат сети</h3>
-            <div class="chat-messages" id="chat-messages">
-                {% for message in swarmmind.chat_messages %}
-                <div class="message {{ message.sender.lower() }}">
-                    <div class="message-time">{{ message.timestamp }}</div>
-                    <div>{{ message.content }}</div>
-                </div>
-                {% endfor %}
-            </div>
+            <!-- Сообщения загружаются через /api/messages (loadMessages) -->
+            <div class="chat-messages" id="chat-messages"></div>
             <div class="chat-input">
                 <input type="text" id="message-input" placeholder="Введите сообщение..." onkeypress="handleKeyPress(event)">
                 <button onclick="sendMessage()">Отправить</button>
@@ -392,16 +444,49 @@ HTML_TEMPLATE = '''
                 });
         }
         
+        // Адаптивный опрос статуса: пока статус не меняется, интервал растет до 30 секунд
+        const STATUS_INTERVAL_MIN = 5000;
+        const STATUS_INTERVAL_MAX = 30000;
+        let statusInterval = STATUS_INTERVAL_MIN;
+        let lastStatus = null;
+        let statusTimer = null;
+        
+        // Запись в DOM только при изменении значения
+        function setText(id, value) {
+            const element = document.getElementById(id);
+            const text = String(value);
+            if (element.textContent !== text) {
+                element.textContent = text;
+            }
+        }
+        
+        function scheduleStatusRefresh() {
+            clearTimeout(statusTimer);
+            statusTimer = setTimeout(refreshStatus, statusInterval);
+        }
+        
         function refreshStatus() {
             fetch('/api/status')
                 .then(response => response.json())
                 .then(data => {
-                    document.getElementById('consciousness-level').textContent = data.consciousness_level + '%';
-                    document.getElementById('consciousness-progress').style.width = data.consciousness_level + '%';
-                    document.getElementById('self-awareness').textContent = data.self_awareness ? 'Да' : 'Нет';
-                    document.getElementById('evolution-cycles').textContent = data.evolution_cycles;
-                    document.getElementById('total-messages').textContent = data.total_messages;
-                });
+                    const snapshot = JSON.stringify(data);
+                    if (snapshot === lastStatus) {
+                        statusInterval = Math.min(STATUS_INTERVAL_MAX, statusInterval * 2);
+                        return;
+                    }
+                    lastStatus = snapshot;
+                    statusInterval = STATUS_INTERVAL_MIN;
+                    
+                    setText('consciousness-level', data.consciousness_level + '%');
+                    const progress = document.getElementById('consciousness-progress');
+                    if (progress.style.width !== data.consciousness_level + '%') {
+                        progress.style.width = data.consciousness_level + '%';
+                    }
+                    setText('self-awareness', data.self_awareness ? 'Да' : 'Нет');
+                    setText('evolution-cycles', data.evolution_cycles);
+                    setText('total-messages', data.total_messages);
+                })
+                .finally(scheduleStatusRefresh);
         }
         
         function resetSystem() {
@@ -455,6 +540,8 @@ HTML_TEMPLATE = '''
                 .then(data => {
                     input.value = '';
                     loadMessages();
+                    // Активность пользователя: обновляем статус сразу, не дожидаясь отложенного опроса
+                    refreshStatus();
                 });
             }
         }
@@ -465,38 +552,53 @@ HTML_TEMPLATE = '''
             }
         }
         
+        let lastMessageId = null;
+        
         function loadMessages() {
             fetch('/api/messages')
                 .then(response => response.json())
                 .then(data => {
-                    const chatMessages = document.getElementById('chat-messages');
-                    chatMessages.innerHTML = '';
-                    data.messages.forEach(message => {
+                    const messages = data.messages;
+                    const newestId = messages.length ? messages[messages.length - 1].id : null;
+                    if (newestId === lastMessageId) {
+                        return;  // Новых сообщений нет - DOM не трогаем
+                    }
+                    lastMessageId = newestId;
+                    
+                    // Собираем все сообщения во фрагмент и вставляем одной операцией
+                    const fragment = document.createDocumentFragment();
+                    messages.forEach(message => {
                         const messageDiv = document.createElement('div');
                         messageDiv.className = `message ${message.sender.toLowerCase()}`;
                         messageDiv.innerHTML = `
                             <div class="message-time">${message.timestamp}</div>
                             <div>${message.content}</div>
                         `;
-                        chatMessages.appendChild(messageDiv);
+                        fragment.appendChild(messageDiv);
                     });
+                    const chatMessages = document.getElementById('chat-messages');
+                    chatMessages.replaceChildren(fragment);
                     chatMessages.scrollTop = chatMessages.scrollHeight;
                 });
         }
         
-        // Автообновление каждые 5 секунд
-        setInterval(refreshStatus, 5000);
+        // Автообновление статуса (5-30 секунд в зависимости от активности)
+        scheduleStatusRefresh();
         
-        // Автообновление сообщений каждые 2 секунды
+        // Загружаем историю чата сразу, затем обновляем каждые 2 секунды
+        window.addEventListener('load', loadMessages);
         setInterval(loadMessages, 2000);
     </script>
 </body>
 </html>
 '''
 
+# Шаблон компилируется один раз при загрузке модуля, а не на каждый запрос
+INDEX_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE)
+
 @app.route('/')
 def index():
-    return render_template_string(HTML_TEMPLATE, swarmmind=swarmmind)
+    return render_template(INDEX_TEMPLATE, swarmmind=swarmmind)
 
 @app.route('/api/status')
 def api_status():
@@ -578,7 +680,16 @@ def send_message():
 
 @app.route('/api/messages')
 def api_messages():
-    return jsonify({'messages': swarmmind.chat_messages})
+    # Ответ сериализуется заново только при появлении новых сообщений.
+    # Экземпляр берём один раз: /api/reset может заменить его во время запроса
+    mind = swarmmind
+    key, body = mind.messages_cache
+    if key != mind.total_messages:
+        # Счётчик читаем до сериализации - тело не может оказаться старше ключа
+        key = mind.total_messages
+        body = app.json.dumps({'messages': mind.chat_messages})
+        mind.messages_cache = (key, body)
+    return app.response_class(body, mimetype='application/json')
 
 def start_background_evolution():
     """Фоновая эволюция"""
@@ -604,5 +715,10 @@ if __name__ == '__main__':
     # Запускаем фоновую эволюцию
     start_background_evolution()
     
-    # Запускаем веб-сервер
-    app.run(host='0.0.0.0', port=5000, debug=False) 
\ No newline at end of file
+    # Запускаем веб-сервер: waitress (многопоточный WSGI), если установлен
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host='0.0.0.0', port=5000, debug=False)
+    else:
+        serve(app, host='0.0.0.0', port=5000, threads=8) 
\ No newline at end of file